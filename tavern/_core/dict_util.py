@@ -96,6 +96,10 @@ def format_keys(
     Raises:
         MissingFormatError: If a format variable is missing
     """
+    if isinstance(val, str) and "{" not in val and "}" not in val:
+        # Nothing to format, so skip creating the formatter entirely
+        return val
+
     if isinstance(variables, box.Box):
         box_vars = variables
     else:
@@ -108,12 +112,16 @@ def format_keys(
             return include_path
 
         try:
-            formatted = val.format(**box_vars)
+            # Only looks up the variables actually used in the string, rather
+            # than copying every variable like format(**box_vars) would
+            formatted = val.format_map(box_vars)
         except KeyError as e:
             if dangerously_ignore_string_format_errors:
                 return val
+            # Box wraps the original KeyError message in its own
+            missing = e.args[0] if isinstance(e, box.BoxKeyError) and e.args else e
             raise exceptions.MissingFormatError(
-                f"Tried to use format variable '{e}' but it was not in any "
+                f"Tried to use format variable '{missing}' but it was not in any "
                 f"configuration file used by the test"
             ) from e
         except ValueError as e:
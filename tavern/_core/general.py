@@ -42,12 +42,14 @@ def load_global_config(global_cfg_paths: list[Union[str, os.PathLike]]) -> dict:
     return global_cfg
 
 
-valid_http_methods = [
-    "GET",
-    "PUT",
-    "POST",
-    "DELETE",
-    "PATCH",
-    "OPTIONS",
-    "HEAD",
-]
+valid_http_methods = frozenset(
+    {
+        "GET",
+        "PUT",
+        "POST",
+        "DELETE",
+        "PATCH",
+        "OPTIONS",
+        "HEAD",
+    }
+)
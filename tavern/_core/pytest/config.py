@@ -19,12 +19,26 @@ from tavern._core.strict_util import StrictLevel
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass(frozen=True)
+class HttpPoolConfig:
+    """Settings for the HTTP connection pool shared between tests
+
+    Attributes:
+        max_sockets: maximum number of connections kept open to each host
+        prewarm: urls to open connections to before the first HTTP request is sent
+    """
+
+    max_sockets: int = 50
+    prewarm: tuple[str, ...] = ()
+
+
 @dataclasses.dataclass(frozen=True)
 class TavernInternalConfig:
     """Internal config that should be used only by tavern"""
 
     pytest_hook_caller: Any
     backends: dict
+    http_pool: HttpPoolConfig = dataclasses.field(default_factory=HttpPoolConfig)
 
 
 @dataclasses.dataclass(frozen=True)
@@ -8,6 +8,7 @@ The module contains utility functions that support the pytest integration,
 including option parsing, configuration management, and helper functions.
 """
 
+import dataclasses
 import logging
 from functools import lru_cache
 from pathlib import Path
@@ -15,9 +16,14 @@ from typing import Any, Optional, TypeVar, Union, cast
 
 import pytest
 
+from tavern._core import exceptions
 from tavern._core.dict_util import format_keys, get_tavern_box
 from tavern._core.general import load_global_config
-from tavern._core.pytest.config import TavernInternalConfig, TestConfig
+from tavern._core.pytest.config import (
+    HttpPoolConfig,
+    TavernInternalConfig,
+    TestConfig,
+)
 from tavern._core.strict_util import StrictLevel
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -68,6 +74,17 @@ def add_parser_options(parser_addoption, with_defaults: bool = True) -> None:
         default=False,
         action="store_true",
     )
+    parser_addoption(
+        "--tavern-http-pool-maxsize",
+        help="Maximum number of HTTP connections to keep open to each host",
+        default=None,
+        type=int,
+    )
+    parser_addoption(
+        "--tavern-http-prewarm",
+        help="One or more urls to open HTTP connections to before the first HTTP request",
+        nargs="+",
+    )
     parser_addoption(
         "--tavern-file-path-regex",
         help="Regex to search for Tavern YAML test files",
@@ -121,6 +138,17 @@ def add_ini_options(parser: pytest.Parser) -> None:
         type="bool",
         default=False,
     )
+    parser.addini(
+        "tavern-http-pool-maxsize",
+        help="Maximum number of HTTP connections to keep open to each host",
+        default=None,
+    )
+    parser.addini(
+        "tavern-http-prewarm",
+        help="One or more urls to open HTTP connections to before the first HTTP request",
+        type="linelist",
+        default=[],
+    )
     parser.addini(
         "tavern-file-path-regex",
         help="Regex to search for Tavern YAML test files",
@@ -187,6 +215,7 @@ def _load_global_cfg(pytest_config: pytest.Config) -> TestConfig:
         tavern_internal=TavernInternalConfig(
             pytest_hook_caller=pytest_config.hook,
             backends=_load_global_backends(pytest_config),
+            http_pool=_load_global_http_pool(pytest_config, variables),
         ),
         stages=global_cfg_dict.get("stages", []),
     )
@@ -215,6 +244,43 @@ def _load_global_follow_redirects(pytest_config: pytest.Config) -> bool:
     return get_option_generic(pytest_config, "tavern-always-follow-redirects", False)
 
 
+def _load_global_http_pool(
+    pytest_config: pytest.Config, variables: dict
+) -> HttpPoolConfig:
+    """Load the settings for the shared HTTP connection pool
+
+    Urls to prewarm can use variables from the global config files"""
+    pool_config = HttpPoolConfig()
+
+    # An unset ini option is an empty string. Anything else, including 0 from
+    # the command line, is validated
+    max_sockets: Optional[str] = get_option_generic(
+        pytest_config, "tavern-http-pool-maxsize", None
+    )
+    if max_sockets is not None and max_sockets != "":
+        try:
+            pool_size = int(max_sockets)
+        except ValueError as e:
+            raise exceptions.InvalidConfigurationException(
+                f"tavern-http-pool-maxsize should be an integer, got '{max_sockets}'"
+            ) from e
+
+        if pool_size < 1:
+            raise exceptions.InvalidConfigurationException(
+                f"tavern-http-pool-maxsize should be at least 1, got {pool_size}"
+            )
+
+        pool_config = dataclasses.replace(pool_config, max_sockets=pool_size)
+
+    prewarm: list[str] = get_option_generic(pytest_config, "tavern-http-prewarm", [])
+    if prewarm:
+        pool_config = dataclasses.replace(
+            pool_config, prewarm=tuple(format_keys(list(prewarm), variables))
+        )
+
+    return pool_config
+
+
 T = TypeVar("T", bound=Optional[Union[str, list, list[Path], list[str], bool]])
 
 
@@ -482,7 +482,7 @@ def validate_http_method(value: str, rule_obj: Any, path: str) -> bool:
     if not isinstance(value, str):
         raise BadSchemaError("HTTP method should be a string")
 
-    if value not in valid_http_methods:
+    if value.upper() not in valid_http_methods:
         logger = get_pykwalify_logger("tavern.schemas.extensions")
         logger.debug(
             "Givern HTTP method '%s' was not one of %s - assuming it will be templated",
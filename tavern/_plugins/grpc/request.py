@@ -16,7 +16,6 @@ import warnings
 from typing import Union
 
 import grpc
-from box import Box
 
 from tavern._core import exceptions
 from tavern._core.dict_util import check_expected_keys, format_keys
@@ -62,11 +61,15 @@ class GRPCRequest(BaseRequest):
     Similar to RestRequest, publishes a single message.
     """
 
+    __slots__ = ("_original_request_vars", "_prepared", "_service_name")
+
     _warned = False
 
     def __init__(
         self, client: GRPCClient, request_spec: dict, test_block_config: TestConfig
     ) -> None:
+        super().__init__(client, request_spec, test_block_config)
+
         if not self._warned:
             warnings.warn(
                 "Tavern gRPC support is experimental and will be updated in a future release.",
@@ -104,6 +107,5 @@ class GRPCRequest(BaseRequest):
             logger.exception("Error executing request")
             raise exceptions.GRPCRequestException from e
 
-    @property
-    def request_vars(self) -> Box:
-        return Box(self._original_request_vars)
+    def _get_request_vars(self) -> dict:
+        return self._original_request_vars
@@ -12,8 +12,6 @@ import functools
 import json
 import logging
 
-from box.box import Box
-
 from tavern._core import exceptions
 from tavern._core.dict_util import check_expected_keys, format_keys
 from tavern._core.extfunctions import update_from_ext
@@ -49,9 +47,13 @@ class MQTTRequest(BaseRequest):
     Similar to RestRequest, publishes a single message.
     """
 
+    __slots__ = ("_original_publish_args", "_prepared", "_publish_args")
+
     def __init__(
         self, client: MQTTClient, rspec: dict, test_block_config: TestConfig
     ) -> None:
+        super().__init__(client, rspec, test_block_config)
+
         expected = {"topic", "payload", "json", "qos", "retain"}
 
         check_expected_keys(expected, rspec)
@@ -84,6 +86,5 @@ class MQTTRequest(BaseRequest):
             logger.exception("Error publishing")
             raise exceptions.MQTTRequestException from e
 
-    @property
-    def request_vars(self) -> Box:
-        return Box(self._original_publish_args)
+    def _get_request_vars(self) -> dict:
+        return self._original_publish_args
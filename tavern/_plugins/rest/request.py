@@ -8,18 +8,19 @@ The module contains classes and functions for building and sending HTTP requests
 with various authentication methods, headers, and payload formats for REST APIs.
 """
 
+import atexit
 import contextlib
+import functools
 import json
 import logging
 import warnings
 from collections.abc import Callable, Mapping
 from contextlib import ExitStack
-from itertools import filterfalse, tee
 from typing import ClassVar, Optional
 from urllib.parse import quote_plus
 
 import requests
-from box.box import Box
+from requests.adapters import HTTPAdapter
 from requests.cookies import cookiejar_from_dict
 from requests.utils import dict_from_cookiejar
 
@@ -32,8 +33,83 @@ from tavern._core.report import attach_yaml
 from tavern._plugins.rest.files import get_file_arguments, guess_filespec
 from tavern.request import BaseRequest
 
+
+def _stdlib_json_dumps(value) -> str:
+    # Compact and UTF-8 rather than ascii escaped, like orjson
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _contains_float(value) -> bool:
+    if isinstance(value, float):
+        return True
+    if isinstance(value, dict):
+        return any(_contains_float(v) for v in value.values())
+    if isinstance(value, list | tuple):
+        return any(_contains_float(v) for v in value)
+    return False
+
+
+try:
+    import orjson
+
+    def _json_dumps(value) -> str:
+        # orjson formats floats differently to json (eg, 1e+16 is written as
+        # 1e16 and NaN as null), so anything with a float is encoded with json.
+        # orjson raises an error for integers wider than 64 bits, non-string
+        # keys and dates, which are also passed to json so that they are
+        # encoded (or rejected) the same way whether orjson is installed or not
+        if _contains_float(value):
+            return _stdlib_json_dumps(value)
+
+        try:
+            encoded = orjson.dumps(value, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except orjson.JSONEncodeError:
+            return _stdlib_json_dumps(value)
+
+        return encoded.decode("utf8")
+
+except ImportError:
+    _json_dumps = _stdlib_json_dumps
+
+
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Number of hosts to keep connection pools for in the shared adapter
+_POOL_CONNECTIONS = 20
+
+# Keys which are allowed in a request block
+_EXPECTED_KEYS = frozenset(
+    {
+        "method",
+        "url",
+        "headers",
+        "data",
+        "params",
+        "auth",
+        "json",
+        "verify",
+        "files",
+        "file_body",
+        "stream",
+        "timeout",
+        "cookies",
+        "cert",
+        # "hooks",
+        "follow_redirects",
+    }
+)
+
+# Mutually exclusive ways of sending a request body
+_CONTENT_KEYS = ("data", "json", "files", "file_body")
+
+# Passed straight through to requests if present
+_OPTIONAL_PASSTHROUGH = frozenset({"verify", "stream"})
+
+# These verbs _can_ send a body but the body _should_ be ignored according
+# to the specs - some info here:
+# https://developer.mozilla.org/en-US/docs/Web/HTTP/Methods
+_BODYLESS_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 
 def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
     """Format the test spec given values inthe global config
@@ -60,9 +136,7 @@ def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
     if "headers" not in rspec:
         rspec["headers"] = {}
 
-    content_keys = ["data", "json", "files", "file_body"]
-
-    in_request = [c for c in content_keys if c in rspec]
+    in_request = [c for c in _CONTENT_KEYS if c in rspec]
     if len(in_request) > 1:
         # Explicitly raise an error here
         # From requests docs:
@@ -74,10 +148,11 @@ def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
                 "send {})".format(" and ".join(in_request))
             )
 
-    normalised_headers = {k.lower(): v for k, v in rspec["headers"].items()}
+    # Lower each header name exactly once and reuse it below
+    lowered_headers = [(k, k.lower(), v) for k, v in rspec["headers"].items()]
+    normalised_headers = {lower: v for _, lower, v in lowered_headers}
 
-    def get_header(name):
-        return normalised_headers.get(name, None)
+    get_header = normalised_headers.get
 
     content_header = get_header("content-type")
     encoding_header = get_header("content-encoding")
@@ -89,19 +164,16 @@ def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
                 "files - this will be ignored"
             )
             rspec["headers"] = {
-                i: j
-                for i, j in normalised_headers.items()
-                if i.lower() != "content-type"
+                k: v for k, lower, v in lowered_headers if lower != "content-type"
             }
 
     fspec = format_keys(rspec, test_block_config.variables)
 
-    if fspec["method"] not in valid_http_methods:
-        raise exceptions.BadSchemaError(
-            "Unknown HTTP method {}".format(
-                fspec["method"]
-            )
-        )
+    # Allow methods to be specified in lower case
+    method = fspec["method"] = fspec["method"].upper()
+
+    if method not in valid_http_methods:
+        raise exceptions.BadSchemaError(f"Unknown HTTP method {method}")
 
     # If the user is using the file_body key, try to guess what type of file/encoding it is.
     filename = fspec.get("file_body")
@@ -189,18 +261,13 @@ def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
     # eg https://openid.net/specs/openid-connect-core-1_0.html#ClaimsParameter
     # > ...represented in an OAuth 2.0 request as UTF-8 encoded JSON (which ends
     # > up being form-urlencoded when passed as an OAuth parameter)
-    for key, value in request_args.get("params", {}).items():
-        if not isinstance(value, str):
-            if key == "$ext":
-                logger.debug("Skipping converting of ext function (%s)", value)
-                continue
-
-        if isinstance(value, dict):
-            request_args["params"][key] = quote_plus(json.dumps(value))
-
-    optional = {"verify", "stream"}
+    # ext functions are resolved after this, so leave them alone
+    if params := request_args.get("params"):
+        for key, value in params.items():
+            if isinstance(value, dict) and key != "$ext":
+                params[key] = quote_plus(_json_dumps(value))
 
-    for key in optional:
+    for key in _OPTIONAL_PASSTHROUGH:
         if key in fspec:
             request_args[key] = fspec[key]
 
@@ -208,10 +275,7 @@ def get_request_args(rspec: dict, test_block_config: TestConfig) -> dict:
     # requests takes all of these - we need to parse the input to get them
     # "cookies",
 
-    # These verbs _can_ send a body but the body _should_ be ignored according
-    # to the specs - some info here:
-    # https://developer.mozilla.org/en-US/docs/Web/HTTP/Methods
-    if request_args["method"] in ["GET", "HEAD", "OPTIONS"]:
+    if method in _BODYLESS_METHODS:
         if any(i in request_args for i in ["json", "data"]):
             warnings.warn(  # noqa
                 "You are trying to send a body with a HTTP verb that has no semantic use for it",
@@ -292,9 +356,6 @@ def _read_expected_cookies(
     Returns:
         cookies to use in request, if any
     """
-    # Need to do this down here - it is separate from getting request args as
-    # it depends on the state of the session
-    existing_cookies = session.cookies.get_dict()
     cookies_to_use = format_keys(
         rspec.get("cookies", None), test_block_config.variables
     )
@@ -306,21 +367,25 @@ def _read_expected_cookies(
         logger.debug("Not sending any cookies with request")
         return {}
 
-    def partition(pred, iterable):
-        """From itertools documentation"""
-        t1, t2 = tee(iterable)
-        return list(filterfalse(pred, t1)), list(filter(pred, t2))
-
     # Cookies are either a single list item, specitying which cookie to send, or
     # a mapping, specifying cookies to override
-    expected, extra = partition(lambda x: isinstance(x, dict), cookies_to_use)
+    expected: list = []
+    extra: list = []
+    for cookie in cookies_to_use:
+        (extra if isinstance(cookie, dict) else expected).append(cookie)
 
-    missing = set(expected) - set(existing_cookies.keys())
+    # Need to do this down here - it is separate from getting request args as
+    # it depends on the state of the session. Only read the cookies which are
+    # actually wanted rather than the whole jar.
+    wanted = set(expected)
+    existing_cookies = {c.name: c.value for c in session.cookies if c.name in wanted}
+
+    missing = wanted - existing_cookies.keys()
 
     if missing:
         logger.error("Missing cookies")
         raise exceptions.MissingCookieError(
-            f"Tried to use cookies '{expected}' in request but only had '{existing_cookies}' available"
+            f"Tried to use cookies '{expected}' in request but only had '{session.cookies.get_dict()}' available"
         )
 
     # 'extra' should be a list of dictionaries - merge them into one here
@@ -340,11 +405,133 @@ def _read_expected_cookies(
             f"Asked to use cookie {overwritten} from previous request but also redefined it as {from_extra}"
         )
 
-    from_cookiejar = {c: existing_cookies.get(c) for c in expected}
+    from_cookiejar = {c: existing_cookies[c] for c in expected}
 
     return deep_dict_merge(from_cookiejar, from_extra)
 
 
+class _SharedHTTPAdapter(HTTPAdapter):
+    """HTTP adapter which is shared between the sessions for every test
+
+    A new session is created for each test so that cookies are not shared
+    between tests, and it is closed at the end of the test, which closes all of
+    its connections. Mounting this adapter on each session instead means that
+    connections are kept alive and reused by later tests. The connections are
+    only closed when the process exits.
+    """
+
+    def close(self) -> None:
+        """Does nothing, so closing a session leaves the connections open"""
+
+    def close_pool(self) -> None:
+        """Actually close all connections"""
+        super().close()
+
+
+@functools.lru_cache
+def _get_shared_adapter(
+    pool_maxsize: int, prewarm: tuple[str, ...] = ()
+) -> _SharedHTTPAdapter:
+    adapter = _SharedHTTPAdapter(
+        pool_connections=_POOL_CONNECTIONS, pool_maxsize=pool_maxsize
+    )
+    atexit.register(adapter.close_pool)
+
+    if prewarm:
+        _prewarm_connections(adapter, prewarm)
+
+    return adapter
+
+
+def _mount_adapter(session: requests.Session, adapter: HTTPAdapter) -> None:
+    """Mount the adapter on the session, unless the session might have been set
+    up with its own adapters which should be kept
+
+    Only plain requests sessions which still have the default adapters are
+    changed, so custom session types keep their own adapters.
+    """
+    if type(session) is not requests.Session:
+        logger.debug("Not using shared connection pool for %s", type(session))
+        return
+
+    for prefix in ("https://", "http://"):
+        if type(session.adapters.get(prefix)) is HTTPAdapter:
+            session.mount(prefix, adapter)
+
+
+def _prewarm_connections(adapter: HTTPAdapter, urls: tuple[str, ...]) -> None:
+    """Open a connection to each url, so that later requests to these hosts
+    do not have to wait for DNS lookup and the TLS handshake
+
+    This is done when the shared adapter is created, which is when the first
+    HTTP request is prepared, so the time taken counts towards that test. Any
+    errors are logged and then ignored - the tests will report them if the
+    server really is unavailable.
+    """
+    with requests.Session() as session:
+        _mount_adapter(session, adapter)
+
+        for url in urls:
+            logger.debug("Opening connection to %s", url)
+            try:
+                session.head(url, timeout=2, allow_redirects=False)
+            except requests.RequestException as e:
+                logger.warning("Unable to open connection to %s: %s", url, e)
+
+
+def _use_shared_pool(session: requests.Session, test_block_config: TestConfig) -> None:
+    """Send requests from this session using the shared connection pool"""
+    pool_config = test_block_config.tavern_internal.http_pool
+    adapter = _get_shared_adapter(pool_config.max_sockets, pool_config.prewarm)
+    _mount_adapter(session, adapter)
+
+
+def _send_request(
+    session: requests.Session,
+    request_args: dict,
+    file_body: Optional[str],
+    test_block_config: TestConfig,
+) -> requests.Response:
+    """Send the request, opening any files which need to be sent with it
+
+    Args:
+        session: session to send the request with
+        request_args: arguments to pass to requests
+        file_body: path to a file to send as the body, if any
+        test_block_config: config available for test
+
+    Returns:
+        response object
+    """
+    # If there are open files, create a context manager around each so
+    # they will be closed at the end of the request.
+    with ExitStack() as stack:
+        stack.enter_context(_set_cookies_for_request(session, request_args))
+
+        # These are mutually exclusive
+        if file_body:
+            # Any headers will have been set in the above function.
+            # Pass the open file rather than its contents - requests
+            # sets the content length from the file size and streams
+            # it in blocks instead of reading it all into memory
+            file = stack.enter_context(open(file_body, "rb"))
+            request_args.update(data=file)
+        else:
+            files = get_file_arguments(request_args, stack, test_block_config)
+            if files:
+                logger.debug("Sending %d files in request", len(files["files"]))
+                request_args.update(files)
+
+        # requests needs header names and values to be strings. This is done
+        # here so that any headers added by hooks are converted as well
+        if "headers" in request_args:
+            request_args["headers"] = {
+                str(k): str(v) for k, v in request_args["headers"].items()
+            }
+
+        return session.request(**request_args)
+
+
 class RestRequest(BaseRequest):
     """REST request implementation for Tavern.
 
@@ -365,7 +552,9 @@ class RestRequest(BaseRequest):
         # "auth"
     ]
 
-    _request_args: Box
+    __slots__ = ("_prepared", "_request_args")
+
+    _request_args: dict
 
     def __init__(
         self, session: requests.Session, rspec: dict, test_block_config: TestConfig
@@ -373,7 +562,8 @@ class RestRequest(BaseRequest):
         """Prepare request
 
         Args:
-            session: existing session
+            session: existing session for this test. This is set up to use a
+                connection pool which is shared between tests
             rspec: test spec
             test_block_config: Any configuration for this the block of
                 tests
@@ -382,30 +572,14 @@ class RestRequest(BaseRequest):
             UnexpectedKeysError: If some unexpected keys were used in the test
                 spec. Only valid keyword args to requests can be passed
         """
+        super().__init__(session, rspec, test_block_config)
+
+        _use_shared_pool(session, test_block_config)
 
         if rspec.pop("clear_session_cookies", False):
             session.cookies.clear_session_cookies()
 
-        expected = {
-            "method",
-            "url",
-            "headers",
-            "data",
-            "params",
-            "auth",
-            "json",
-            "verify",
-            "files",
-            "file_body",
-            "stream",
-            "timeout",
-            "cookies",
-            "cert",
-            # "hooks",
-            "follow_redirects",
-        }
-
-        check_expected_keys(expected, rspec)
+        check_expected_keys(_EXPECTED_KEYS, rspec)
 
         request_args = get_request_args(rspec, test_block_config)
         update_from_ext(
@@ -429,39 +603,19 @@ class RestRequest(BaseRequest):
 
         logger.debug("Request args: %s", request_args)
 
-        self._request_args = Box(request_args)
+        self._request_args = request_args
 
         # There is no way using requests to make a prepared request that will
         # not follow redirects, so instead we have to do this. This also means
         # that we can't have the 'pre-request' hook any more because we don't
-        # create a prepared request.
-
-        def prepared_request():
-            # If there are open files, create a context manager around each so
-            # they will be closed at the end of the request.
-            with ExitStack() as stack:
-                stack.enter_context(_set_cookies_for_request(session, request_args))
-
-                # These are mutually exclusive
-                if file_body:
-                    # Any headers will have been set in the above function
-                    file = stack.enter_context(open(file_body, "rb"))
-                    self._request_args.update(data=file)
-                else:
-                    files = get_file_arguments(
-                        self._request_args, stack, test_block_config
-                    )
-                    if files:
-                        logger.debug("Sending %d files in request", len(files["files"]))
-                        self._request_args.update(files)
-
-                headers = self._request_args.get("headers", {})
-                for k, v in headers.items():
-                    headers[str(k)] = str(v)
-
-                return session.request(**self._request_args)
-
-        self._prepared: Callable[[], requests.Response] = prepared_request
+        # create a prepared request. The request args are passed in when it is
+        # run, so any changes made to request_vars by hooks are sent.
+        self._prepared: Callable[[dict], requests.Response] = functools.partial(
+            _send_request,
+            session,
+            file_body=file_body,
+            test_block_config=test_block_config,
+        )
 
     def run(self) -> requests.Response:
         """Runs the prepared request and times it
@@ -470,17 +624,18 @@ class RestRequest(BaseRequest):
             response object
         """
 
+        request_args = self.request_vars
+
         attach_yaml(
-            self._request_args,
+            request_args,
             name="rest_request",
         )
 
         try:
-            return self._prepared()
+            return self._prepared(request_args)
         except requests.exceptions.RequestException as e:
             logger.exception("Error running prepared request")
             raise exceptions.RestRequestException from e
 
-    @property
-    def request_vars(self) -> Box:
+    def _get_request_vars(self) -> dict:
         return self._request_args
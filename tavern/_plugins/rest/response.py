@@ -8,15 +8,18 @@ The module contains classes and functions for processing and validating
 HTTP responses from REST API endpoints during testing.
 """
 
+import codecs
 import contextlib
 import json
 import logging
+import re
 from collections.abc import Mapping
-from typing import Any, Union
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Optional, Union
+from urllib.parse import ParseResult, parse_qsl, urlparse
 
 import requests
 from requests.status_codes import _codes  # type:ignore
+from requests.structures import CaseInsensitiveDict
 
 from tavern._core import exceptions
 from tavern._core.dict_util import deep_dict_merge
@@ -25,6 +28,45 @@ from tavern._core.pytest.newhooks import call_hook
 from tavern._core.report import attach_yaml
 from tavern.response import BaseResponse, indent_err_text
 
+# orjson decodes integers wider than 64 bits as floats, so anything with a long
+# run of digits is decoded by the json module instead
+_LONG_DIGITS = re.compile(rb"\d{19,}")
+
+
+def _is_utf8(encoding: Optional[str]) -> bool:
+    """Whether a response body in this encoding can be decoded by orjson"""
+    if encoding is None:
+        return True
+
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
+
+
+try:
+    import orjson
+
+    def _decode_json_body(response: requests.Response) -> Any:
+        # orjson only reads UTF-8, so use requests to decode anything with a
+        # different charset. Fall back to requests for anything else orjson
+        # can't decode as well, for example if it is UTF-16 without a charset
+        content = response.content
+        if (
+            isinstance(content, bytes)
+            and _is_utf8(response.encoding)
+            and not _LONG_DIGITS.search(content)
+        ):
+            with contextlib.suppress(orjson.JSONDecodeError):
+                return orjson.loads(content)
+        return response.json()
+
+except ImportError:
+
+    def _decode_json_body(response: requests.Response) -> Any:
+        return response.json()
+
+
 logger: logging.Logger = logging.getLogger(__name__)
 
 
@@ -43,6 +85,11 @@ class RestResponse(BaseResponse):
 
         super().__init__(name, deep_dict_merge(defaults, expected), test_block_config)
 
+        # Response, parsed redirect location, and redirect query params
+        self._redirect_cache: Optional[
+            tuple[requests.Response, Optional[ParseResult], dict[str, str]]
+        ] = None
+
         def check_code(code: int) -> None:
             if int(code) not in _codes:
                 logger.warning("Unexpected status code '%s'", code)
@@ -63,11 +110,20 @@ class RestResponse(BaseResponse):
         else:
             return "<Not run yet>"
 
-    def _verbose_log_response(self, response: requests.Response) -> None:
-        """Verbosely log the response object, with query params etc."""
+    def _verbose_log_response(self, response: requests.Response, body: Any) -> None:
+        """Verbosely log the response object, with query params etc.
+
+        Args:
+            response: response object
+            body: already decoded body of the response, if any
+        """
 
         logger.info("Response: '%s'", response)
 
+        # Everything else is debug logging
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
         def log_dict_block(block, name):
             if block:
                 to_log = name + ":"
@@ -84,12 +140,10 @@ class RestResponse(BaseResponse):
 
         log_dict_block(response.headers, "Headers")
 
-        with contextlib.suppress(ValueError):
-            log_dict_block(response.json(), "Body")
+        log_dict_block(body, "Body")
 
-        redirect_query_params = self._get_redirect_query_params(response)
-        if redirect_query_params:
-            parsed_url = urlparse(response.headers["location"])
+        parsed_url, redirect_query_params = self._parse_redirect_location(response)
+        if redirect_query_params and parsed_url is not None:
             to_path = "{}://{}{}".format(*parsed_url)
             logger.debug("Redirect location: %s", to_path)
             log_dict_block(redirect_query_params, "Redirect URL query parameters")
@@ -97,6 +151,25 @@ class RestResponse(BaseResponse):
     def _get_redirect_query_params(self, response: requests.Response) -> dict[str, str]:
         """If there was a redirect header, get any query parameters from it"""
 
+        return self._parse_redirect_location(response)[1]
+
+    def _parse_redirect_location(
+        self, response: requests.Response
+    ) -> tuple[Optional[ParseResult], dict[str, str]]:
+        """Parse the redirect header, if there was one. This is only done once
+        per response.
+
+        Returns:
+            The parsed redirect url (or None if there was no redirect) and any
+            query parameters in it
+        """
+
+        if self._redirect_cache is not None and self._redirect_cache[0] is response:
+            return self._redirect_cache[1], self._redirect_cache[2]
+
+        parsed: Optional[ParseResult]
+        redirect_query_params: dict[str, str] = {}
+
         try:
             redirect_url = response.headers["location"]
         except KeyError as e:
@@ -106,13 +179,16 @@ class RestResponse(BaseResponse):
                     self.expected["save"]["redirect_query_params"],
                     e=e,
                 )
-            redirect_query_params = {}
+            parsed = None
         else:
             parsed = urlparse(redirect_url)
-            qp = parsed.query
-            redirect_query_params = {i: j[0] for i, j in parse_qs(qp).items()}
+            # Only keep the first value for each parameter
+            for i, j in parse_qsl(parsed.query):
+                redirect_query_params.setdefault(i, j)
+
+        self._redirect_cache = (response, parsed, redirect_query_params)
 
-        return redirect_query_params
+        return parsed, redirect_query_params
 
     def _check_status_code(self, status_code: Union[int, list[int]], body: Any) -> None:
         expected_code = self.expected["status_code"]
@@ -153,8 +229,6 @@ class RestResponse(BaseResponse):
         Raises:
             TestFailError: Something went wrong with validating the response
         """
-        self._verbose_log_response(response)
-
         call_hook(
             self.test_block_config,
             "pytest_tavern_beta_after_every_response",
@@ -162,14 +236,17 @@ class RestResponse(BaseResponse):
             response=response,
         )
 
-        self.response = response
-
-        # Get things to use from the response
+        # Get things to use from the response. This is done after the hook is
+        # called in case the hook changes the response
         try:
-            body = response.json()
+            body = _decode_json_body(response)
         except ValueError:
             body = None
 
+        self._verbose_log_response(response, body)
+
+        self.response = response
+
         redirect_query_params = self._get_redirect_query_params(response)
 
         # Run validation on response
@@ -194,13 +271,13 @@ class RestResponse(BaseResponse):
         # Get any keys to save
         saved: dict = {}
 
-        saved.update(self.maybe_get_save_values_from_save_block("json", body))
-        saved.update(
-            self.maybe_get_save_values_from_save_block("headers", response.headers)
-        )
         saved.update(
-            self.maybe_get_save_values_from_save_block(
-                "redirect_query_params", redirect_query_params
+            self._collect_saved(
+                {
+                    "json": body,
+                    "headers": response.headers,
+                    "redirect_query_params": redirect_query_params,
+                }
             )
         )
 
@@ -219,6 +296,36 @@ class RestResponse(BaseResponse):
 
         return saved
 
+    def _collect_saved(self, sources: Mapping[str, Any]) -> dict:
+        """Get values to save from each part of the response, reading the save
+        block only once
+
+        Args:
+            sources: mapping of the name of each part of the response (json,
+                headers, etc) to the actual part of the response
+
+        Returns:
+            mapping of save_name: value for everything that was saved
+        """
+        saved: dict = {}
+
+        save_block = self.expected.get("save", {})
+        if not save_block:
+            return saved
+
+        for key, save_from in sources.items():
+            try:
+                to_save = save_block[key]
+            except KeyError:
+                logger.debug("Nothing expected to save for %s", key)
+                continue
+
+            saved.update(
+                self.maybe_get_save_values_from_given_block(key, save_from, to_save)
+            )
+
+        return saved
+
     def _validate_block(self, blockname: str, block: Mapping) -> None:
         """Validate a block of the response
 
@@ -237,14 +344,23 @@ class RestResponse(BaseResponse):
                     blockname,
                 )
 
+        test_strictness = self.test_block_config.strict
+        block_strictness = test_strictness.option_for(blockname)
+
         if blockname == "headers" and expected_block is not None:
             # Special case for headers. These need to be checked in a case
-            # insensitive manner
-            block = {i.lower(): j for i, j in block.items()}
+            # insensitive manner. The response headers from requests are
+            # already a CaseInsensitiveDict, so look the expected headers up in
+            # that rather than lowering the name of every response header
+            if not isinstance(block, CaseInsensitiveDict):
+                block = CaseInsensitiveDict(block)
             expected_block = {i.lower(): j for i, j in expected_block.items()}
+            if block_strictness.is_on():
+                # Need all of them to check for extra headers in the response
+                block = dict(block.lower_items())
+            else:
+                block = {i: block[i] for i in expected_block if i in block}
 
         logger.debug("Validating response %s against %s", blockname, expected_block)
 
-        test_strictness = self.test_block_config.strict
-        block_strictness = test_strictness.option_for(blockname)
         self.recurse_check_key_match(expected_block, block, blockname, block_strictness)
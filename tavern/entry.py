@@ -9,12 +9,16 @@ Tavern tests from the command line.
 """
 
 import argparse
-import logging.config
+import logging
 from argparse import ArgumentParser
-from textwrap import dedent
+from typing import Optional
 
 from .core import run_legacy
 
+_DESCRIPTION = """Parse yaml + make requests against an API
+
+Any extra arguments will be passed directly to Pytest. Run py.test --help for a list"""
+
 
 class TavernArgParser(ArgumentParser):
     """Command-line argument parser for Tavern testing framework.
@@ -22,16 +26,17 @@ class TavernArgParser(ArgumentParser):
     This class extends ArgumentParser to provide Tavern-specific command-line
     options and argument handling for the testing framework.
     """
-    def __init__(self) -> None:
-        description = """Parse yaml + make requests against an API
-
-        Any extra arguments will be passed directly to Pytest. Run py.test --help for a list"""
 
+    def __init__(self) -> None:
         super().__init__(
-            description=dedent(description),
+            description=_DESCRIPTION,
             formatter_class=argparse.RawDescriptionHelpFormatter,
         )
 
+        self._configure()
+
+    def _configure(self) -> None:
+        """Add Tavern's arguments. Subclasses can extend this to add more"""
         self.add_argument("in_file", help="Input file with tests in")
 
         self.add_argument(
@@ -53,19 +58,17 @@ class TavernArgParser(ArgumentParser):
         )
 
 
-def main() -> None:
-    """Main entry point for the Tavern testing framework.
+def _configure_logging(
+    log_level: str, log_loc: Optional[str], log_to_stdout: bool
+) -> None:
+    """Set up logging to a file and/or stdout
 
-    This function parses command-line arguments, configures logging,
-    and executes the test suite using the Tavern testing framework.
+    Args:
+        log_level: level to log at
+        log_loc: file to log to, if any
+        log_to_stdout: whether to log to stdout
     """
-    args, remaining = TavernArgParser().parse_known_args()
-    vargs = vars(args)
-
-    if vargs.pop("debug"):
-        log_level = "DEBUG"
-    else:
-        log_level = "INFO"
+    import logging.config  # noqa: PLC0415
 
     # Basic logging config that will print out useful information
     log_cfg: dict = {
@@ -90,8 +93,6 @@ def main() -> None:
         },
     }
 
-    log_loc = vargs.pop("log_to_file")
-
     if log_loc:
         log_cfg["handlers"].update(
             {
@@ -105,11 +106,38 @@ def main() -> None:
 
         log_cfg["loggers"]["tavern"]["handlers"].append("to_file")
 
-    if vargs.pop("stdout"):
+    if log_to_stdout:
         log_cfg["loggers"]["tavern"]["handlers"].append("to_stdout")
 
     logging.config.dictConfig(log_cfg)
 
+
+def main() -> None:
+    """Main entry point for the Tavern testing framework.
+
+    This function parses command-line arguments, configures logging,
+    and executes the test suite using the Tavern testing framework.
+    """
+    args, remaining = TavernArgParser().parse_known_args()
+    vargs = vars(args)
+
+    if vargs.pop("debug"):
+        log_level = "DEBUG"
+    else:
+        log_level = "INFO"
+
+    log_loc = vargs.pop("log_to_file")
+    log_to_stdout = vargs.pop("stdout")
+
+    if log_loc or log_to_stdout:
+        _configure_logging(log_level, log_loc, log_to_stdout)
+    else:
+        # Nothing is being logged anywhere, so avoid the cost of dictConfig
+        for logger_name in ("tavern", ""):
+            logger = logging.getLogger(logger_name)
+            logger.addHandler(logging.NullHandler())
+            logger.setLevel(log_level)
+
     in_file = vargs.pop("in_file")
     global_cfg = vargs.pop("tavern_global_cfg", {})
 
@@ -10,6 +10,7 @@ with various authentication methods, headers, and payload formats.
 
 import logging
 from abc import abstractmethod
+from collections.abc import Mapping
 from typing import Any
 
 import box
@@ -25,23 +26,60 @@ class BaseRequest:
     This abstract base class defines the interface that all request
     implementations must follow. It provides methods for request execution
     and variable management.
+
+    Attributes:
+        _session: session passed in when the request was created, for
+            subclasses which need it again after preparing the request
+        _test_block_config: configuration passed in when the request was
+            created, for the same reason
     """
-    @abstractmethod
+
+    __slots__ = ("_request_vars", "_session", "_test_block_config")
+
+    _request_vars: box.Box
+
     def __init__(
         self, session: Any, rspec: dict, test_block_config: TestConfig
-    ) -> None: ...
+    ) -> None:
+        """Prepare request. Subclasses should call this before preparing the
+        request from rspec
+
+        Args:
+            session: session created by the plugin for this test. The same
+                session is passed to every stage in the test, so requests should
+                be sent using it rather than opening new connections, so that
+                connections can be reused
+            rspec: test spec
+            test_block_config: Any configuration for this the block of tests
+        """
+        self._session = session
+        self._test_block_config = test_block_config
 
     @property
-    @abstractmethod
     def request_vars(self) -> box.Box:
         """
         Variables used in the request
 
-        What is contained in the return value will change depending on the type of request
+        What is contained in the return value will change depending on the type of request.
+        This is only created once per request.
 
         Returns:
             box.Box: box of request vars
         """
+        try:
+            return self._request_vars
+        except AttributeError:
+            self._request_vars = box.Box(self._get_request_vars())
+            return self._request_vars
+
+    @abstractmethod
+    def _get_request_vars(self) -> Mapping:
+        """
+        Get the raw variables used in the request, used to create request_vars
+
+        Returns:
+            Mapping: request vars
+        """
 
     @abstractmethod
     def run(self):
@@ -1,11 +1,16 @@
+import dataclasses
 from unittest.mock import Mock, patch
 
 import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 
 from tavern._core import exceptions
 from tavern._core.dict_util import format_keys
 from tavern._core.loader import ANYTHING
-from tavern._plugins.rest.response import RestResponse
+from tavern._core.strict_util import StrictLevel
+from tavern._plugins.rest.response import RestResponse, _decode_json_body
 
 
 @pytest.fixture(name="example_response")
@@ -113,6 +118,29 @@ class TestSave:
 
         assert saved == {"test_search": "breadsticks"}
 
+    def test_collect_saved(self, example_response, includes):
+        """Save from several parts of the response at once"""
+        example_response["save"] = {
+            "json": {"test_code": "code"},
+            "headers": {"next_location": "location"},
+        }
+
+        r = RestResponse(Mock(), "Test 1", example_response, includes)
+
+        saved = r._collect_saved(
+            {
+                "json": example_response["json"],
+                "headers": example_response["headers"],
+                "redirect_query_params": {},
+            }
+        )
+
+        assert saved == {
+            "test_code": example_response["json"]["code"],
+            "next_location": example_response["headers"]["location"],
+        }
+        assert not r.errors
+
     @pytest.mark.parametrize("save_from", ("json", "headers", "redirect_query_params"))
     def test_bad_save(self, save_from, example_response, includes):
         example_response["save"] = {save_from: {"abc": "123"}}
@@ -178,6 +206,46 @@ class TestValidate:
 
         assert not r.errors
 
+    def test_validate_headers_case_insensitive(self, example_response, includes):
+        """Header names are compared case insensitively"""
+
+        r = RestResponse(Mock(), "Test 1", example_response, includes)
+
+        r._validate_block(
+            "headers",
+            CaseInsensitiveDict(
+                {
+                    "content-type": "application/json",
+                    "Location": "www.google.com?search=breadsticks",
+                }
+            ),
+        )
+
+        assert not r.errors
+
+    @pytest.mark.parametrize("strict", (True, False))
+    def test_validate_headers_extra_in_response(
+        self, example_response, includes, strict
+    ):
+        """Extra headers in the response are only an error if strict is on"""
+        strictness = StrictLevel.all_on() if strict else StrictLevel.all_off()
+        includes = dataclasses.replace(includes, strict=strictness)
+
+        r = RestResponse(Mock(), "Test 1", example_response, includes)
+
+        r._validate_block(
+            "headers",
+            CaseInsensitiveDict(
+                {
+                    "CONTENT-TYPE": "application/json",
+                    "Location": "www.google.com?search=breadsticks",
+                    "X-Extra": "abc",
+                }
+            ),
+        )
+
+        assert bool(r.errors) == strict
+
     def test_simple_validate_redirect_query_params(self, example_response, includes):
         """Make sure a simple value comparison works"""
 
@@ -311,6 +379,7 @@ class TestFull:
         class FakeResponse:
             headers = example_response["headers"]
             content = b"test"
+            encoding = "utf-8"
 
             def json(self):
                 return example_response["json"]
@@ -328,6 +397,7 @@ class TestFull:
         class FakeResponse:
             headers = example_response["headers"]
             content = b"test"
+            encoding = "utf-8"
 
             def json(self):
                 return example_response["json"]
@@ -350,6 +420,7 @@ class TestFull:
         class FakeResponse:
             headers = nested_response["headers"]
             content = b"test"
+            encoding = "utf-8"
 
             def json(self):
                 return nested_response["json"]
@@ -368,6 +439,7 @@ class TestFull:
         class FakeResponse:
             headers = example_response["headers"]
             content = b"test"
+            encoding = "utf-8"
 
             def json(self):
                 return value
@@ -376,6 +448,153 @@ class TestFull:
 
         r.verify(FakeResponse())
 
+    def test_save_redirect_query_params(self, example_response, includes):
+        """Only the first value of a repeated query parameter is saved"""
+        example_response["headers"]["location"] = "www.google.com?a=1&b=2&a=3"
+        example_response["save"] = {
+            "redirect_query_params": {"saved_a": "a", "saved_b": "b"}
+        }
+        r = RestResponse(Mock(), "Test 1", example_response, includes)
+
+        class FakeResponse:
+            headers = example_response["headers"]
+            content = b"test"
+            encoding = "utf-8"
+
+            def json(self):
+                return example_response["json"]
+
+            status_code = example_response["status_code"]
+
+        saved = r.verify(FakeResponse())
+
+        assert saved == {"saved_a": "1", "saved_b": "2"}
+
+    def test_missing_redirect_reported_once(self, example_response, includes):
+        """Wanting to save from a redirect that didn't happen is only one error"""
+        del example_response["headers"]["location"]
+        example_response["save"] = {"redirect_query_params": {"saved_a": "a"}}
+        r = RestResponse(Mock(), "Test 1", example_response, includes)
+
+        class FakeResponse:
+            headers = example_response["headers"]
+            content = b"test"
+            encoding = "utf-8"
+
+            def json(self):
+                return example_response["json"]
+
+            status_code = example_response["status_code"]
+
+        with pytest.raises(exceptions.TestFailError):
+            r.verify(FakeResponse())
+
+        assert len([e for e in r.errors if "no redirect url" in e]) == 1
+
+
+class TestVerboseLog:
+    def test_body_decoded_once(self, example_response, includes):
+        """The body is decoded once and shared with the verbose logging"""
+        r = RestResponse(Mock(), "Test 1", example_response, includes)
+        response = Mock(
+            headers=example_response["headers"],
+            status_code=example_response["status_code"],
+            cookies={},
+        )
+        response.json.return_value = example_response["json"]
+
+        with patch(
+            "tavern._plugins.rest.response.logger.isEnabledFor", return_value=True
+        ):
+            r.verify(response)
+
+        assert response.json.call_count == 1
+
+    def test_body_decoded_after_hook(self, example_response, includes):
+        """Changes made to the response by the after_every_response hook are
+        used when validating it"""
+        r = RestResponse(Mock(), "Test 1", example_response, includes)
+        response = Mock(
+            headers=example_response["headers"],
+            status_code=example_response["status_code"],
+            cookies={},
+        )
+        response.json.return_value = {"wrong": "body"}
+
+        def fix_body(expected, response):
+            response.json.return_value = example_response["json"]
+
+        hook_caller = includes.tavern_internal.pytest_hook_caller
+        hook_caller.pytest_tavern_beta_after_every_response.side_effect = fix_body
+
+        r.verify(response)
+
+
+class TestDecodeBody:
+    """Bodies are decoded the same way whether orjson is installed or not"""
+
+    @pytest.fixture(name="decode_json_body", params=["orjson", "requests"])
+    def fix_decode_json_body(self, request):
+        if request.param == "orjson":
+            pytest.importorskip("orjson")
+            return _decode_json_body
+
+        return requests.Response.json
+
+    @staticmethod
+    def _response(content: bytes, content_type: str) -> requests.Response:
+        response = requests.Response()
+        response._content = content
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"Content-Type": content_type})
+        # Set by requests when the response is received
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+    @pytest.mark.parametrize(
+        "content, content_type",
+        (
+            (b'{"a": ["b", 1]}', "application/json"),
+            ('{"a": ["b", 1]}'.encode("utf16"), "application/json; charset=utf-16"),
+            ('{"a": ["b", 1]}'.encode("latin1"), "application/json; charset=latin1"),
+        ),
+    )
+    def test_decode_json(self, decode_json_body, content, content_type):
+        response = self._response(content, content_type)
+
+        assert decode_json_body(response) == {"a": ["b", 1]}
+
+    @pytest.mark.parametrize(
+        "content_type, expected",
+        (
+            ("text/plain", "cafÃ©"),
+            ("application/json; charset=latin-1", "cafÃ©"),
+            ("application/json; charset=utf-8", "café"),
+            ("application/json", "café"),
+        ),
+    )
+    def test_decode_uses_charset(self, decode_json_body, content_type, expected):
+        """Non-ASCII bodies are decoded using the charset of the response"""
+        response = self._response('{"a": "café"}'.encode(), content_type)
+
+        assert decode_json_body(response) == {"a": expected}
+
+    def test_decode_large_int(self, decode_json_body):
+        response = self._response(
+            b'{"a": 123456789012345678901234567890}', "application/json"
+        )
+
+        decoded = decode_json_body(response)
+
+        assert decoded == {"a": 123456789012345678901234567890}
+        assert isinstance(decoded["a"], int)
+
+    def test_decode_not_json(self, decode_json_body):
+        response = self._response(b"<html></html>", "text/html")
+
+        with pytest.raises(ValueError):
+            decode_json_body(response)
+
 
 def test_status_code_warns(example_response, includes):
     """Should continue if the status code is nonexistent"""
@@ -11,7 +11,8 @@ import pytest
 import requests
 
 from tavern._core import exceptions
-from tavern._core.pytest.util import load_global_cfg
+from tavern._core.pytest.config import HttpPoolConfig
+from tavern._core.pytest.util import _load_global_http_pool, load_global_cfg
 from tavern._core.run import run_test
 from tavern._plugins.mqtt.client import MQTTClient
 
@@ -44,6 +45,7 @@ def fix_mock_response_args(fulltest):
     args = {
         "spec": requests.Response,
         "content": json.dumps(content).encode("utf8"),
+        "encoding": "utf-8",
         "status_code": response["status_code"],
         "json": lambda: content,
         "headers": response["headers"],
@@ -86,6 +88,7 @@ class TestRunStages:
         """Wrong body returned"""
 
         mockargs["json"] = lambda: {"wrong": "thing"}
+        mockargs["content"] = json.dumps({"wrong": "thing"}).encode("utf8")
 
         mock_response = Mock(**mockargs)
 
@@ -366,6 +369,7 @@ class TestFormatRequestVars:
         if request_key == "json":
             resp_key = "json"
             mockargs[request_key] = lambda: {"returned": sent_value}
+            mockargs["content"] = json.dumps({"returned": sent_value}).encode("utf8")
         else:
             resp_key = request_key
             mockargs[request_key] = {"returned": sent_value}
@@ -388,7 +392,8 @@ class TestFormatRequestVars:
     def test_format_request_var_value(self, fulltest, mockargs, includes, request_key):
         """Variables from request should be available to format in response"""
 
-        sent_value = str(uuid.uuid4())
+        # Upper case because the HTTP method is normalised to upper case
+        sent_value = str(uuid.uuid4()).upper()
 
         fulltest["stages"][0]["request"]["method"] = "POST"
         fulltest["stages"][0]["request"][request_key] = sent_value
@@ -668,6 +673,57 @@ def test_copy_config(pytestconfig):
     assert cfg_2.variables.get("test1") is None
 
 
+class TestHttpPoolConfig:
+    @staticmethod
+    def _pytest_config(ini=None, cli=None):
+        """Mimics pytest, which returns an empty string for unset ini options"""
+        ini = ini or {}
+        cli = cli or {}
+        config = Mock()
+        config.getini.side_effect = lambda name: ini.get(
+            name, [] if name == "tavern-http-prewarm" else ""
+        )
+        config.getoption.side_effect = cli.get
+        return config
+
+    def test_unset(self):
+        pool_config = _load_global_http_pool(self._pytest_config(), {})
+
+        assert pool_config == HttpPoolConfig()
+
+    def test_ini(self):
+        pool_config = _load_global_http_pool(
+            self._pytest_config(ini={"tavern-http-pool-maxsize": "3"}), {}
+        )
+
+        assert pool_config.max_sockets == 3
+
+    def test_cli_overrides_ini(self):
+        pool_config = _load_global_http_pool(
+            self._pytest_config(
+                ini={"tavern-http-pool-maxsize": "3"},
+                cli={"tavern_http_pool_maxsize": 7},
+            ),
+            {},
+        )
+
+        assert pool_config.max_sockets == 7
+
+    @pytest.mark.parametrize("value", ("abc", "1.5", "0", "-2"))
+    def test_invalid(self, value):
+        with pytest.raises(exceptions.InvalidConfigurationException):
+            _load_global_http_pool(
+                self._pytest_config(ini={"tavern-http-pool-maxsize": value}), {}
+            )
+
+    @pytest.mark.parametrize("value", (0, -2))
+    def test_invalid_cli(self, value):
+        with pytest.raises(exceptions.InvalidConfigurationException):
+            _load_global_http_pool(
+                self._pytest_config(cli={"tavern_http_pool_maxsize": value}), {}
+            )
+
+
 class TestHooks:
     def test_before_every_request_hook_called(self, fulltest, mockargs, includes):
         """Verify that the before_every_request hook is called"""
@@ -1,9 +1,11 @@
+import copy
 import dataclasses
+import datetime
 import os
 import tempfile
 from contextlib import ExitStack
 from textwrap import dedent
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 import requests
@@ -12,11 +14,13 @@ from requests.cookies import RequestsCookieJar
 
 from tavern._core import exceptions
 from tavern._core.extfunctions import update_from_ext
+from tavern._core.pytest.config import HttpPoolConfig
 from tavern._plugins.rest.files import get_file_arguments
 from tavern._plugins.rest.request import (
     RestRequest,
     _check_allow_redirects,
     _read_expected_cookies,
+    _stdlib_json_dumps,
     get_request_args,
 )
 
@@ -65,6 +69,133 @@ class TestRequests:
                 Mock(spec=requests.Session, cookies=RequestsCookieJar()), req, includes
             )
 
+    def test_headers_sent_as_strings(self, req, includes):
+        """Header names and values are converted to strings before sending"""
+        req["headers"]["X-Count"] = 3
+        session = Mock(spec=requests.Session, cookies=RequestsCookieJar())
+
+        RestRequest(session, req, includes).run()
+
+        sent_headers = session.request.call_args.kwargs["headers"]
+        assert sent_headers["X-Count"] == "3"
+
+    def test_headers_added_to_request_vars_sent_as_strings(self, req, includes):
+        session = Mock(spec=requests.Session, cookies=RequestsCookieJar())
+        request = RestRequest(session, req, includes)
+
+        request.request_vars["headers"]["X-Added"] = 4
+        request.run()
+
+        assert session.request.call_args.kwargs["headers"]["X-Added"] == "4"
+
+    def test_request_vars_changes_sent(self, req, includes):
+        """Changes made to request_vars (eg, by hooks) are sent in the request"""
+        session = Mock(spec=requests.Session, cookies=RequestsCookieJar())
+        request = RestRequest(session, req, includes)
+
+        request.request_vars["json"] = {"value": 123}
+        request.run()
+
+        assert session.request.call_args.kwargs["json"] == {"value": 123}
+
+    def test_request_vars_created_once(self, req, includes):
+        request = RestRequest(
+            Mock(spec=requests.Session, cookies=RequestsCookieJar()), req, includes
+        )
+
+        assert request.request_vars is request.request_vars
+        assert request.request_vars.method == "POST"
+
+    def test_no_instance_dict(self, req, includes):
+        request = RestRequest(
+            Mock(spec=requests.Session, cookies=RequestsCookieJar()), req, includes
+        )
+
+        assert not hasattr(request, "__dict__")
+
+
+class TestConnectionPool:
+    def test_pool_shared_between_sessions(self, req, includes):
+        """Connections are reused between the sessions for different tests"""
+        sessions = [requests.Session(), requests.Session()]
+
+        for session in sessions:
+            RestRequest(session, copy.deepcopy(req), includes)
+
+        adapters = [s.get_adapter("https://example.com") for s in sessions]
+        assert adapters[0] is adapters[1]
+        assert sessions[0].get_adapter("http://example.com") is adapters[0]
+
+    def test_custom_session_adapter_kept(self, req, includes):
+        """Adapters mounted by a custom session type are not replaced"""
+
+        class RetrySession(requests.Session):
+            def __init__(self):
+                super().__init__()
+                self.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
+
+        session = RetrySession()
+        custom = session.get_adapter("https://example.com")
+
+        RestRequest(session, req, includes)
+
+        assert session.get_adapter("https://example.com") is custom
+
+    def test_non_default_adapter_kept(self, req, includes):
+        custom = Mock(spec=requests.adapters.BaseAdapter)
+        session = requests.Session()
+        session.mount("https://", custom)
+
+        RestRequest(session, req, includes)
+
+        assert session.get_adapter("https://example.com") is custom
+        assert session.get_adapter("http://example.com") is not custom
+
+    def test_pool_size_from_config(self, req, includes):
+        includes = dataclasses.replace(
+            includes,
+            tavern_internal=dataclasses.replace(
+                includes.tavern_internal, http_pool=HttpPoolConfig(max_sockets=3)
+            ),
+        )
+        session = requests.Session()
+
+        RestRequest(session, req, includes)
+
+        assert session.get_adapter("https://example.com")._pool_maxsize == 3
+
+    def test_prewarm_urls(self, req, includes):
+        """Prewarm urls are requested once, and errors are ignored"""
+        includes = dataclasses.replace(
+            includes,
+            tavern_internal=dataclasses.replace(
+                includes.tavern_internal,
+                http_pool=HttpPoolConfig(
+                    max_sockets=4, prewarm=("https://a.com/", "https://b.com/")
+                ),
+            ),
+        )
+
+        with patch(
+            "tavern._plugins.rest.request.requests.Session.head",
+            side_effect=requests.ConnectionError,
+        ) as mock_head:
+            RestRequest(requests.Session(), copy.deepcopy(req), includes)
+            RestRequest(requests.Session(), copy.deepcopy(req), includes)
+
+        assert [c.args[0] for c in mock_head.call_args_list] == [
+            "https://a.com/",
+            "https://b.com/",
+        ]
+
+    def test_closing_session_keeps_pool(self, req, includes):
+        with requests.Session() as session:
+            RestRequest(session, req, includes)
+            adapter = session.get_adapter("https://example.com")
+            adapter.poolmanager.connection_from_url("https://example.com")
+
+        assert adapter.poolmanager.pools
+
 
 class TestHttpRedirects:
     def test_session_called_no_redirects(self, req, includes):
@@ -143,6 +274,19 @@ class TestCookies:
 
         assert _read_expected_cookies(mock_session, req, includes) == {"a": 2}
 
+    def test_only_wanted_cookies_used(self, req, includes):
+        """Other cookies in the session are not sent"""
+
+        cookiejar = RequestsCookieJar()
+        cookiejar.set("a", 2)
+        cookiejar.set("b", 3)
+
+        req["cookies"] = ["b"]
+
+        mock_session = Mock(spec=requests.Session, cookies=cookiejar)
+
+        assert _read_expected_cookies(mock_session, req, includes) == {"b": 3}
+
     def test_format_cookies(self, req, includes):
         """cookies in request should be formatted"""
 
@@ -208,6 +352,19 @@ class TestRequestArgs:
 
         assert args["method"] == "POST"
 
+    def test_lower_case_method(self, req, includes):
+        req["method"] = "post"
+
+        args = get_request_args(req, includes)
+
+        assert args["method"] == "POST"
+
+    def test_unknown_method(self, req, includes):
+        req["method"] = "FETCH"
+
+        with pytest.raises(exceptions.BadSchemaError):
+            get_request_args(req, includes)
+
     @pytest.mark.parametrize("extra", [{}, {"json": [1, 2, 3]}, {"data": {"a": 2}}])
     def test_no_default_content_type(self, req, includes, extra):
         del req["headers"]["Content-Type"]
@@ -252,12 +409,13 @@ class TestRequestArgs:
 
         assert args["headers"]["content-type"] == "application/x-www-form-urlencoded"
 
-    def test_nested_params_encoded(self, req, includes):
-        req["params"] = {"a": {"b": {"c": "d"}}}
+    def test_nested_params_ext_not_encoded(self, req, includes):
+        ext = {"function": "copy:copy", "extra_args": [{"a": "b"}]}
+        req["params"] = {"$ext": ext}
 
         args = get_request_args(req, includes)
 
-        assert args["params"]["a"] == "%7B%22b%22%3A+%7B%22c%22%3A+%22d%22%7D%7D"
+        assert args["params"]["$ext"] == ext
 
     def test_array_substitution(self, req, includes):
         args = get_request_args(req, includes)
@@ -288,6 +446,15 @@ class TestRequestArgs:
 
         assert "content-type" not in [i.lower() for i in args["headers"].keys()]
 
+    def test_files_keeps_other_header_names(self, req, includes):
+        """Dropping the content type for multipart files leaves other headers intact"""
+        del req["data"]
+        req["files"] = ["abc"]
+
+        args = get_request_args(req, includes)
+
+        assert list(args["headers"]) == ["Authorization"]
+
     @pytest.mark.parametrize("cert_value", ("a", ("a", "b"), ["a", "b"]))
     def test_cert_with_valid_values(self, req, includes, cert_value):
         req["cert"] = cert_value
@@ -305,6 +472,53 @@ class TestRequestArgs:
         assert args["verify"] == verify_values
 
 
+class TestNestedParams:
+    """Nested params are encoded the same way whether orjson is installed or not"""
+
+    @pytest.fixture(autouse=True, params=["orjson", "json"])
+    def json_dumps(self, request):
+        if request.param == "orjson":
+            pytest.importorskip("orjson")
+            yield
+        else:
+            with patch("tavern._plugins.rest.request._json_dumps", _stdlib_json_dumps):
+                yield
+
+    def test_nested_params_encoded(self, req, includes):
+        req["params"] = {"a": {"b": {"c": "d"}}}
+
+        args = get_request_args(req, includes)
+
+        assert args["params"]["a"] == "%7B%22b%22%3A%7B%22c%22%3A%22d%22%7D%7D"
+
+    def test_nested_params_encoded_utf8(self, req, includes):
+        req["params"] = {"a": {"b": "\u00e9", 1: 2}}
+
+        args = get_request_args(req, includes)
+
+        assert args["params"]["a"] == "%7B%22b%22%3A%22%C3%A9%22%2C%221%22%3A2%7D"
+
+    def test_nested_params_large_int_encoded(self, req, includes):
+        req["params"] = {"a": {"b": 2**70}}
+
+        args = get_request_args(req, includes)
+
+        assert args["params"]["a"] == "%7B%22b%22%3A1180591620717411303424%7D"
+
+    def test_nested_params_floats_encoded(self, req, includes):
+        req["params"] = {"a": {"b": 1e16, "c": float("nan")}}
+
+        args = get_request_args(req, includes)
+
+        assert args["params"]["a"] == "%7B%22b%22%3A1e%2B16%2C%22c%22%3ANaN%7D"
+
+    def test_nested_params_date_not_encoded(self, req, includes):
+        req["params"] = {"a": {"b": datetime.date(2020, 1, 1)}}
+
+        with pytest.raises(TypeError):
+            get_request_args(req, includes)
+
+
 class TestExtFunctions:
     def test_get_from_function(self, req, includes):
         """Make sure ext functions work in request
@@ -391,6 +605,24 @@ class TestFileBody:
         assert args["headers"]["content-type"] == "application/x-tar"
         assert args["headers"]["Content-Encoding"] == "gzip"
 
+    def test_file_body_sent_as_file(self, req, includes):
+        """The file is passed to requests as a file object so it is streamed"""
+
+        req.pop("data")
+        session = Mock(spec=requests.Session, cookies=RequestsCookieJar())
+
+        with tempfile.NamedTemporaryFile(encoding="utf8", mode="w") as tmpin:
+            tmpin.write("OK")
+            tmpin.flush()
+
+            req["file_body"] = tmpin.name
+
+            RestRequest(session, req, includes).run()
+
+        sent = session.request.call_args.kwargs["data"]
+        assert sent.name == tmpin.name
+        assert sent.closed
+
 
 class TestGetFiles:
     @pytest.fixture
@@ -345,6 +345,13 @@ class TestFormatKeys:
         with pytest.raises(exceptions.MissingFormatError):
             format_keys(to_format, {})
 
+    def test_format_missing_names_variable(self):
+        with pytest.raises(exceptions.MissingFormatError) as e:
+            format_keys("{b}", {"a": "c"})
+
+        assert "'b'" in str(e.value)
+        assert '"' not in str(e.value)
+
     def test_format_success(self):
         to_format = {"a": "{b}"}
 
@@ -366,6 +373,13 @@ class TestFormatKeys:
         formatted_2 = format_keys(formatted, {})
         assert formatted_2 == final_value
 
+    @pytest.mark.parametrize("literal", ("plain", "", "b"))
+    def test_literal_returned_unchanged(self, literal):
+        """Strings without any format fields are returned as-is"""
+        assert format_keys({"a": literal}, {"b": "!include other.yaml"}) == {
+            "a": literal
+        }
+
 
 class TestRecurseAccess:
     @pytest.fixture